@@ -8,6 +8,7 @@ from repoclean.config_loader import load_config
 from repoclean.fixer import apply_fix, get_fix_targets
 from repoclean.gitignore import get_default_gitignore
 from repoclean.hooks import install_pre_commit_hook, uninstall_pre_commit_hook
+from repoclean.path_utils import list_staged_paths
 from repoclean.scanner import scan_repo
 from repoclean.secrets import scan_secrets
 from repoclean.serializer import scanresult_to_dict, secrets_to_dict, to_json
@@ -115,11 +116,15 @@ def cmd_gate(args):
 
     cfg = load_config(args.path)
 
+    # one staged listing for both scanners
+    staged_paths = list_staged_paths(Path(args.path).resolve()) if args.staged_only else None
+
     scan_result = scan_repo(
         repo_path=args.path,
         max_file_mb=cfg.max_file_mb,
         config=cfg,
         staged_only=args.staged_only,
+        staged_paths=staged_paths,
     )
 
     secret_findings = scan_secrets(
@@ -128,6 +133,7 @@ def cmd_gate(args):
         config=cfg,
         min_severity=args.secrets_min_severity,
         staged_only=args.staged_only,
+        staged_paths=staged_paths,
     )
 
 
@@ -296,11 +302,15 @@ def cmd_ci(args):
         console.print(f"Valid: {', '.join(sorted(FAIL_CATEGORIES))}")
         raise SystemExit(2)
 
+    # one staged listing for both scanners
+    staged_paths = list_staged_paths(Path(args.path).resolve()) if args.staged_only else None
+
     scan_result = scan_repo(
         repo_path=args.path,
         max_file_mb=max_mb,
         config=cfg,
         staged_only=args.staged_only,
+        staged_paths=staged_paths,
     )
 
     secret_findings = scan_secrets(
@@ -309,6 +319,7 @@ def cmd_ci(args):
     config=cfg,
     min_severity=args.secrets_min_severity,
     staged_only=args.staged_only,
+    staged_paths=staged_paths,
 )
 
 
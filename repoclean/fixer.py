@@ -44,6 +44,7 @@ def get_fix_targets(repo: Path, config=None, staged_only: bool = False):
         max_file_mb=max_mb,
         config=config,
         staged_only=staged_only,
+        need_tracked_junk=False,  # fix only touches working-tree junk
     )
 
     junk_dirs = [repo / Path(p) for p in result.junk_dirs]
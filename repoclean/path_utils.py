@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 import subprocess
 
@@ -40,6 +41,16 @@ def _norm_ext(ext: str) -> str:
     return ext
 
 
+def suffix_lower(name: str) -> str:
+    """
+    Lowercased suffix of a file name, as Path(name).suffix.lower() gives it:
+    a leading dot (".env") is not a suffix. A trailing dot ("x.") yields ".",
+    which no extension set contains.
+    """
+    dot = name.rfind(".")
+    return name[dot:].lower() if dot > 0 else ""
+
+
 def should_ignore(
     rel_path: str,
     *,
@@ -78,6 +89,102 @@ def should_ignore(
     return False
 
 
+def should_ignore_file(
+    rel_path: str,
+    *,
+    ignore_dirs: list[str],
+    ignore_files: list[str],
+    ignore_extensions: list[str],
+) -> bool:
+    """
+    should_ignore() for a file whose parent directory was already checked
+    (and not pruned) during the walk.
+
+    Any ignore_dirs prefix would have matched that parent, so only the
+    name/extension rules and exact path matches are left to test. The path
+    is normalized exactly as should_ignore() does it (a root ".env" is
+    matched as "env"), so both always agree.
+    """
+    rel_path = _norm_rel_path(rel_path)
+    name = rel_path[rel_path.rfind("/") + 1:]
+
+    for f in ignore_files:
+        if name == (f or "").strip():
+            return True
+
+    lowered = name.lower()
+    for ext in ignore_extensions:
+        ext = _norm_ext(ext)
+        if ext and lowered.endswith(ext):
+            return True
+
+    for d in ignore_dirs:
+        d = _norm_dir_prefix(d)
+        if d and rel_path == d:
+            return True
+
+    return False
+
+
+def should_ignore_dir(rel_path: str, *, ignore_dirs: list[str]) -> bool:
+    """
+    The ignore_dirs rule of should_ignore() alone: True when every file under
+    rel_path would be ignored by it, so a walk can prune the directory.
+
+    ignore_files / ignore_extensions name files, not directories; they are
+    left to should_ignore_file() for the files themselves.
+    """
+    rel_path = _norm_rel_path(rel_path)
+
+    for d in ignore_dirs:
+        d = _norm_dir_prefix(d)
+        if not d:
+            continue
+        if rel_path == d or rel_path.startswith(d + "/"):
+            return True
+
+    return False
+
+
+def scandir_walk(root: Path):
+    """
+    os.walk() replacement built on os.scandir().
+
+    Yields (rel_prefix, dir_entries, file_entries) top-down, where rel_prefix
+    is the root-relative posix dir path with a trailing "/" ("" for root).
+    DirEntry caches the d_type and stat() result, so files cost at most one
+    stat syscall. Like os.walk, callers prune by removing from dir_entries,
+    and symlinked dirs are listed but not descended into.
+    """
+    stack = [(os.fspath(root), "")]
+    while stack:
+        dirpath, prefix = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        dir_entries = []
+        file_entries = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                dir_entries.append(entry)
+            else:
+                file_entries.append(entry)
+
+        yield prefix, dir_entries, file_entries
+
+        for entry in reversed(dir_entries):
+            if entry.is_symlink():
+                continue
+            stack.append((entry.path, prefix + entry.name + "/"))
+
+
 def is_allowlisted(rel_path: str, allowlist: list[str]) -> bool:
     rel_path = _norm_rel_path(rel_path)
 
@@ -95,6 +202,66 @@ def is_allowlisted(rel_path: str, allowlist: list[str]) -> bool:
     return False
 
 
+def git_read(repo: Path, args: tuple[str, ...]) -> bytes | None:
+    """
+    stdout (bytes) of a read-only git command, None if git failed.
+    """
+    try:
+        p = subprocess.run(["git", "-C", str(repo), *args], capture_output=True)
+    except Exception:
+        return None
+
+    if p.returncode != 0:
+        return None
+    return p.stdout or b""
+
+
+def list_staged_paths(repo: Path) -> list[str]:
+    """
+    Staged paths that still have content to scan, relative to repo (posix),
+    in git's order; [] when git can't answer.
+
+    Callers running several scanners over one commit (gate, ci) fetch it
+    once and pass it on as staged_paths.
+    """
+    # ACMRT: staged deletions have nothing on disk left to scan
+    out = git_read(repo, ("diff", "--cached", "--name-only", "-z", "--diff-filter=ACMRT"))
+    if out is None:
+        return []
+
+    staged: list[str] = []
+    for raw in out.split(b"\0"):
+        if not raw:
+            continue
+        if raw.startswith(b".git/"):
+            continue
+        staged.append(os.fsdecode(raw))
+
+    return staged
+
+
+def list_tracked_paths(repo: Path) -> list[str]:
+    """
+    Paths in the index, relative to repo (posix); [] when git can't answer.
+    Unmerged paths appear once per conflict stage.
+    """
+    # -z: NUL-separated, unquoted paths; bytes mode skips decoding the whole
+    # listing up front, only the paths we keep are decoded
+    out = git_read(repo, ("ls-files", "-z"))
+    if out is None:
+        return []
+
+    tracked: list[str] = []
+    for raw in out.split(b"\0"):
+        if not raw:
+            continue
+        if raw.startswith(b".git/"):
+            continue
+        tracked.append(os.fsdecode(raw))
+
+    return tracked
+
+
 def get_staged_paths(repo_path: str = ".") -> set[str]:
     """
     Return repo-relative POSIX paths staged for commit.
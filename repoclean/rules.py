@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable
 
+from repoclean.path_utils import suffix_lower
+
 
 # --- Default junk rules (built-in) ---
 
-JUNK_DIRS = {
+JUNK_DIRS: frozenset[str] = frozenset({
     "__pycache__",
     ".pytest_cache",
     ".mypy_cache",
@@ -27,14 +31,14 @@ JUNK_DIRS = {
     ".parcel-cache",
     ".next",
     ".nuxt",
-}
+})
 
-JUNK_FILE_EXTS = {".pyc", ".log", ".tmp", ".swp"}
+JUNK_FILE_EXTS: frozenset[str] = frozenset({".pyc", ".log", ".tmp", ".swp"})
 
-JUNK_FILES = {
+JUNK_FILES: frozenset[str] = frozenset({
     ".DS_Store",
     "Thumbs.db",
-}
+})
 
 SENSITIVE_FILES = {
     ".env",
@@ -54,9 +58,12 @@ DEFAULT_MAX_FILE_MB = 25
 
 @dataclass(frozen=True)
 class JunkRules:
-    dirs: set[str]
-    files: set[str]
-    extensions: set[str]
+    dirs: frozenset[str]
+    files: frozenset[str]
+    extensions: frozenset[str]
+
+
+_DEFAULT_JUNK_RULES = JunkRules(dirs=JUNK_DIRS, files=JUNK_FILES, extensions=JUNK_FILE_EXTS)
 
 
 def _normalize_ext(e: str) -> str:
@@ -80,17 +87,21 @@ def get_effective_junk_rules(config=None) -> JunkRules:
     This keeps behavior stable and avoids accidentally weakening repoclean
     just because user config is incomplete.
     """
-    dirs = set(JUNK_DIRS)
-    files = set(JUNK_FILES)
-    exts = {x.lower() for x in JUNK_FILE_EXTS}
-
     if not config:
-        return JunkRules(dirs=dirs, files=files, extensions=exts)
+        return _DEFAULT_JUNK_RULES
 
     cfg_dirs = getattr(config, "junk_dirs", None)
     cfg_files = getattr(config, "junk_files", None)
     cfg_exts = getattr(config, "junk_extensions", None)
 
+    # common case: config present but adds nothing, share the built-in sets
+    if not (cfg_dirs or cfg_files or cfg_exts):
+        return _DEFAULT_JUNK_RULES
+
+    dirs = set(JUNK_DIRS)
+    files = set(JUNK_FILES)
+    exts = set(JUNK_FILE_EXTS)
+
     if cfg_dirs:
         for d in cfg_dirs:
             n = _normalize_name(d)
@@ -112,4 +123,43 @@ def get_effective_junk_rules(config=None) -> JunkRules:
             if n:
                 exts.add(n)
 
-    return JunkRules(dirs=dirs, files=files, extensions=exts)
+    return JunkRules(dirs=frozenset(dirs), files=frozenset(files), extensions=frozenset(exts))
+
+
+@lru_cache(maxsize=16)
+def _junk_dir_rgx(junk_dirs: frozenset[str]) -> re.Pattern | None:
+    """
+    One compiled alternation matching any junk dir as a parent component
+    ("a/node_modules/b.js"), so the per-path check runs in the regex engine
+    instead of a Python loop over the split parts.
+    """
+    if not junk_dirs:
+        return None
+    alt = "|".join(re.escape(d) for d in sorted(junk_dirs, key=len, reverse=True))
+    return re.compile(r"(?:^|/)(?:" + alt + r")/")
+
+
+def is_junk_rel_path(
+    rel_path_posix: str,
+    *,
+    junk_dirs: frozenset[str],
+    junk_files: frozenset[str],
+    junk_exts: frozenset[str],
+) -> bool:
+    """
+    Generic junk detector using effective rules.
+    Works for both tracked junk checks and scanner junk lists.
+    """
+    name = rel_path_posix[rel_path_posix.rfind("/") + 1:]
+
+    if name in junk_files:
+        return True
+
+    if suffix_lower(name) in junk_exts:
+        return True
+
+    rgx = _junk_dir_rgx(junk_dirs)
+    if rgx is not None and rgx.search(rel_path_posix):
+        return True
+
+    return False
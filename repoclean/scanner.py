@@ -1,16 +1,34 @@
 from __future__ import annotations
 
 import os
+import stat
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
-from repoclean.rules import DEFAULT_MAX_FILE_MB, get_effective_junk_rules
+from repoclean.path_utils import list_staged_paths, list_tracked_paths, suffix_lower
+from repoclean.rules import DEFAULT_MAX_FILE_MB, get_effective_junk_rules, is_junk_rel_path
 from repoclean.rules import SENSITIVE_FILES, SENSITIVE_EXTENSIONS
 
 
 @dataclass
 class ScanResult:
+    # no per-instance __dict__ (dataclass(slots=True) would need 3.10+)
+    __slots__ = (
+        "repo_path",
+        "has_git",
+        "has_gitignore",
+        "junk_dirs",
+        "junk_files",
+        "sensitive_files",
+        "large_files",
+        "tracked_junk",
+        "gitignore_missing",
+        "env_unignored",
+        "repo_health_score",
+    )
+
     repo_path: Path
     has_git: bool
     has_gitignore: bool
@@ -27,97 +45,41 @@ class ScanResult:
 
 
 def is_sensitive(path: Path) -> bool:
-    if path.name in SENSITIVE_FILES:
-        return True
-    if path.suffix.lower() in SENSITIVE_EXTENSIONS:
-        return True
-    return False
+    return _sens(path.name, path.suffix.lower())
+
+
+def _sens(name: str, suffix_lower: str) -> bool:
+    # string-only core of is_sensitive, for loops that already have both
+    return name in SENSITIVE_FILES or suffix_lower in SENSITIVE_EXTENSIONS
 
 
 def _git(repo: Path, args: list[str]) -> subprocess.CompletedProcess:
+    # only check-ignore goes through here; listings live in path_utils
     return subprocess.run(
         ["git", "-C", str(repo), *args],
         capture_output=True,
-        text=True,
     )
 
 
-def _get_staged_paths(repo: Path) -> list[str]:
-    try:
-        p = _git(repo, ["diff", "--cached", "--name-only"])
-    except Exception:
-        return []
-
-    if p.returncode != 0:
-        return []
-
-    out = (p.stdout or "").strip()
-    if not out:
-        return []
-
-    staged: list[str] = []
-    for line in out.splitlines():
-        line = line.strip().replace("\\", "/")
-        if not line:
-            continue
-        if line.startswith(".git/"):
-            continue
-        staged.append(line)
-
-    return staged
-
-
-def _get_tracked_paths(repo: Path) -> list[str]:
-    try:
-        p = _git(repo, ["ls-files"])
-    except Exception:
-        return []
-
-    if p.returncode != 0:
-        return []
-
-    out = (p.stdout or "").strip()
-    if not out:
-        return []
-
-    tracked: list[str] = []
-    for line in out.splitlines():
-        rel = line.strip().replace("\\", "/")
-        if not rel:
-            continue
-        if rel.startswith(".git/"):
-            continue
-        tracked.append(rel)
-
-    return tracked
-
-
-def _is_junk_rel_path(
-    rel_path_posix: str,
-    *,
-    junk_dirs: set[str],
-    junk_files: set[str],
-    junk_exts: set[str],
-) -> bool:
+def _gitignore_lists_env(repo: Path) -> bool:
     """
-    Generic junk detector using effective rules.
-    Works for both tracked junk checks and scanner junk lists.
+    Cheap pre-check on the root .gitignore bytes: True when it has a plain
+    ``.env`` / ``/.env`` line and no negations that could re-include it.
+    False means "ask git", not "not ignored".
     """
-    name = rel_path_posix.split("/")[-1]
-
-    if name in junk_files:
-        return True
-
-    suffix = Path(name).suffix.lower()
-    if suffix in junk_exts:
-        return True
-
-    parts = rel_path_posix.split("/")
-    for part in parts[:-1]:
-        if part in junk_dirs:
-            return True
-
-    return False
+    try:
+        data = (repo / ".gitignore").read_bytes()
+    except OSError:
+        return False
+
+    listed = False
+    for line in data.splitlines():
+        line = line.rstrip()
+        if line.startswith(b"!"):
+            return False
+        if line == b".env" or line == b"/.env":
+            listed = True
+    return listed
 
 
 def _gitignore_ignores_env(repo: Path) -> bool:
@@ -178,8 +140,14 @@ def scan_repo(
     max_file_mb: int = DEFAULT_MAX_FILE_MB,
     config=None,
     staged_only: bool = False,
+    need_tracked_junk: bool = True,
+    staged_paths: list[str] | None = None,
 ) -> ScanResult:
-    from repoclean.path_utils import rel_posix, should_ignore, is_allowlisted
+    """
+    staged_paths: the list_staged_paths() result, for callers that already
+    have it (staged_only mode only; fetched here when None).
+    """
+    from repoclean.path_utils import scandir_walk, should_ignore, should_ignore_file, is_allowlisted
 
     repo = Path(repo_path).resolve()
 
@@ -204,6 +172,19 @@ def scan_repo(
     if has_git and not has_gitignore:
         gitignore_missing = True
 
+    # Both git reads below are independent subprocess waits (no GIL held), so
+    # run them in the background while we walk the tree / read the index.
+    git_pool = ThreadPoolExecutor(max_workers=2)
+    env_future = None
+    env_listed = False
+    tracked_future = None
+
+    # tracked junk should NOT pollute staged-only scans
+    # (and skip the git ls-files spawn when the caller doesn't want it)
+    want_tracked = (
+        has_git and not staged_only and need_tracked_junk and bool(jr.dirs or jr.files or jr.extensions)
+    )
+
     # Phase 5: env exists but not ignored (unless allowlisted)
     env_path = repo / ".env"
     if has_git and env_path.exists():
@@ -213,41 +194,31 @@ def scan_repo(
         if not allowlisted_env:
             if not has_gitignore:
                 env_unignored = True
+            elif want_tracked and _gitignore_lists_env(repo):
+                # settled from the ls-files output below, no check-ignore spawn
+                env_listed = True
             else:
-                env_unignored = not _gitignore_ignores_env(repo)
+                env_future = git_pool.submit(_gitignore_ignores_env, repo)
 
-    # tracked junk should NOT pollute staged-only scans
-    if has_git and not staged_only:
-        tracked = _get_tracked_paths(repo)
-        for rel in tracked:
-            # apply config ignore
-            if config and should_ignore(
-                rel,
-                ignore_dirs=config.ignore_dirs,
-                ignore_files=config.ignore_files,
-                ignore_extensions=config.ignore_extensions,
-            ):
-                continue
+    if want_tracked:
+        tracked_future = git_pool.submit(list_tracked_paths, repo)
 
-            if _is_junk_rel_path(
-                rel,
-                junk_dirs=jr.dirs,
-                junk_files=jr.files,
-                junk_exts=jr.extensions,
-            ):
-                tracked_junk.append(rel)
+    # no more work for the pool; already submitted calls still run to completion
+    git_pool.shutdown(wait=False)
 
     # staged-only mode
     if staged_only:
-        staged_rel_paths = _get_staged_paths(repo)
+        staged_rel_paths = list_staged_paths(repo) if staged_paths is None else staged_paths
 
         for rel in staged_rel_paths:
+            # the worktree copy may since be gone or replaced by a dir;
+            # one stat answers both and gives us the size
             try:
-                fp = (repo / rel).resolve()
-            except Exception:
+                st = os.stat(os.path.join(repo, rel))
+            except OSError:
                 continue
 
-            if not fp.exists() or not fp.is_file():
+            if not stat.S_ISREG(st.st_mode):
                 continue
 
             if config and should_ignore(
@@ -259,7 +230,7 @@ def scan_repo(
                 continue
 
             # junk file detection uses merged rules now
-            if _is_junk_rel_path(
+            if is_junk_rel_path(
                 rel,
                 junk_dirs=jr.dirs,
                 junk_files=jr.files,
@@ -267,15 +238,15 @@ def scan_repo(
             ):
                 junk_files.append(rel)
 
-            if is_sensitive(fp):
+            name = rel[rel.rfind("/") + 1:]
+            if _sens(name, suffix_lower(name)):
                 sensitive_files.append(rel)
 
-            try:
-                size = fp.stat().st_size
-                if size > max_bytes:
-                    large_files.append((rel, size))
-            except Exception:
-                pass
+            if st.st_size > max_bytes:
+                large_files.append((rel, st.st_size))
+
+        if env_future is not None:
+            env_unignored = not env_future.result()
 
         score = _compute_health_score(
             has_gitignore=has_gitignore,
@@ -291,9 +262,10 @@ def scan_repo(
             has_git=has_git,
             has_gitignore=has_gitignore,
             junk_dirs=[],
-            junk_files=sorted(set(junk_files)),
-            sensitive_files=sorted(set(sensitive_files)),
-            large_files=sorted(set(large_files)),
+            # git diff --name-only lists each path once, no dedupe needed
+            junk_files=sorted(junk_files),
+            sensitive_files=sorted(sensitive_files),
+            large_files=sorted(large_files),
             tracked_junk=[],
             gitignore_missing=gitignore_missing,
             env_unignored=env_unignored,
@@ -301,48 +273,42 @@ def scan_repo(
         )
 
     # full scan
-    for root, dirs, files in os.walk(repo):
-        root_path = Path(root)
-
-        if ".git" in dirs:
-            dirs.remove(".git")
+    # Dirs are checked against ignore rules once, when we decide whether to
+    # descend; files below only need their name/extension checked.
+    # Prefixes below a reported junk dir: still walked for sensitive / large
+    # files, but their contents aren't listed again as junk.
+    in_junk_dir: set[str] = set()
+    for prefix, dirs, files in scandir_walk(repo):
+        dirs[:] = [d for d in dirs if d.name != ".git"]
 
         # prune ignored dirs
         if config:
-            pruned = []
-            for d in dirs:
-                rel_dir = rel_posix(repo, root_path / d)
-                if should_ignore(
-                    rel_dir,
+            dirs[:] = [
+                d
+                for d in dirs
+                if not should_ignore(
+                    prefix + d.name,
                     ignore_dirs=config.ignore_dirs,
                     ignore_files=config.ignore_files,
                     ignore_extensions=config.ignore_extensions,
-                ):
-                    pruned.append(d)
-            for d in pruned:
-                dirs.remove(d)
-
-        # junk folders
-        for d in list(dirs):
-            if d in jr.dirs:
-                rel_dir = rel_posix(repo, root_path / d)
-
-                if config and should_ignore(
-                    rel_dir,
-                    ignore_dirs=config.ignore_dirs,
-                    ignore_files=config.ignore_files,
-                    ignore_extensions=config.ignore_extensions,
-                ):
-                    continue
-
-                junk_dirs.append(rel_dir)
+                )
+            ]
+
+        # junk folders (ignored ones were pruned above); reported as a whole
+        in_junk = prefix in in_junk_dir
+        for d in dirs:
+            if in_junk:
+                in_junk_dir.add(prefix + d.name + "/")
+            elif d.name in jr.dirs:
+                junk_dirs.append(prefix + d.name)
+                in_junk_dir.add(prefix + d.name + "/")
 
         # junk/sensitive/large files
-        for f in files:
-            fp = root_path / f
-            rel = rel_posix(repo, fp)
+        for entry in files:
+            f = entry.name
+            rel = prefix + f
 
-            if config and should_ignore(
+            if config and should_ignore_file(
                 rel,
                 ignore_dirs=config.ignore_dirs,
                 ignore_files=config.ignore_files,
@@ -350,19 +316,50 @@ def scan_repo(
             ):
                 continue
 
-            if f in jr.files or fp.suffix.lower() in jr.extensions:
+            # computed once for both tests
+            suffix = suffix_lower(f)
+
+            if not in_junk and (f in jr.files or suffix in jr.extensions):
                 junk_files.append(rel)
 
-            if is_sensitive(fp):
+            if _sens(f, suffix):
                 sensitive_files.append(rel)
 
             try:
-                size = fp.stat().st_size
+                size = entry.stat().st_size
                 if size > max_bytes:
                     large_files.append((rel, size))
             except Exception:
                 pass
 
+    if tracked_future is not None:
+        tracked_paths = tracked_future.result()
+
+        # git check-ignore never reports a tracked path as ignored
+        if env_listed:
+            env_unignored = ".env" in tracked_paths
+
+        for rel in tracked_paths:
+            # apply config ignore
+            if config and should_ignore(
+                rel,
+                ignore_dirs=config.ignore_dirs,
+                ignore_files=config.ignore_files,
+                ignore_extensions=config.ignore_extensions,
+            ):
+                continue
+
+            if is_junk_rel_path(
+                rel,
+                junk_dirs=jr.dirs,
+                junk_files=jr.files,
+                junk_exts=jr.extensions,
+            ):
+                tracked_junk.append(rel)
+
+    if env_future is not None:
+        env_unignored = not env_future.result()
+
     score = _compute_health_score(
         has_gitignore=has_gitignore,
         env_unignored=env_unignored,
@@ -376,10 +373,12 @@ def scan_repo(
         repo_path=repo,
         has_git=has_git,
         has_gitignore=has_gitignore,
-        junk_dirs=sorted(set(junk_dirs)),
-        junk_files=sorted(set(junk_files)),
-        sensitive_files=sorted(set(sensitive_files)),
-        large_files=sorted(set(large_files)),
+        # the walk visits each path once; ls-files repeats unmerged paths
+        # (one line per conflict stage), so only tracked_junk needs dedupe
+        junk_dirs=sorted(junk_dirs),
+        junk_files=sorted(junk_files),
+        sensitive_files=sorted(sensitive_files),
+        large_files=sorted(large_files),
         tracked_junk=sorted(set(tracked_junk)),
         gitignore_missing=gitignore_missing,
         env_unignored=env_unignored,
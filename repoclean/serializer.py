@@ -1,32 +1,51 @@
 import json
-from dataclasses import asdict
+import os
 
+try:
+    import orjson  # optional, see to_json()
+except ModuleNotFoundError:
+    orjson = None
 
-def to_json(data) -> str:
-    return json.dumps(data, indent=2, ensure_ascii=False)
 
+if os.sep == "/":
+    def _to_posix(p: str) -> str:
+        # paths came from POSIX APIs already; a backslash here is part of a name
+        return p
+else:
+    def _to_posix(p: str) -> str:
+        return p.replace("\\", "/")
 
-def scanresult_to_dict(result):
-    d = asdict(result)
-
-    d["repo_path"] = str(result.repo_path).replace("\\", "/")
 
-    d["junk_dirs"] = [p.replace("\\", "/") for p in d.get("junk_dirs", [])]
-    d["junk_files"] = [p.replace("\\", "/") for p in d.get("junk_files", [])]
-    d["sensitive_files"] = [p.replace("\\", "/") for p in d.get("sensitive_files", [])]
-
-    d["tracked_junk"] = [p.replace("\\", "/") for p in d.get("tracked_junk", [])]
-
-    d["large_files"] = [
-        {"path": p.replace("\\", "/"), "bytes": size}
-        for (p, size) in getattr(result, "large_files", [])
-    ]
+def to_json(data) -> str:
+    if orjson is not None:
+        try:
+            # same text as the json call below for the *_to_dict payloads
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # e.g. surrogate-escaped file names or ints over 64 bits
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False)
 
-    d["gitignore_missing"] = bool(d.get("gitignore_missing", False))
-    d["env_unignored"] = bool(d.get("env_unignored", False))
-    d["repo_health_score"] = int(d.get("repo_health_score", 0))
 
-    return d
+def scanresult_to_dict(result):
+    # fields spelled out rather than asdict(): it deep-copies every list only
+    # for them to be rebuilt below
+    return {
+        "repo_path": _to_posix(str(result.repo_path)),
+        "has_git": result.has_git,
+        "has_gitignore": result.has_gitignore,
+        "junk_dirs": [_to_posix(p) for p in result.junk_dirs],
+        "junk_files": [_to_posix(p) for p in result.junk_files],
+        "sensitive_files": [_to_posix(p) for p in result.sensitive_files],
+        "large_files": [
+            {"path": _to_posix(p), "bytes": size}
+            for (p, size) in result.large_files
+        ],
+        "tracked_junk": [_to_posix(p) for p in result.tracked_junk],
+        "gitignore_missing": bool(result.gitignore_missing),
+        "env_unignored": bool(result.env_unignored),
+        "repo_health_score": int(result.repo_health_score),
+    }
 
 
 def secrets_to_dict(findings):
@@ -34,8 +53,11 @@ def secrets_to_dict(findings):
         "count": len(findings),
         "findings": [
             {
-                **asdict(f),
-                "file": f.file.replace("\\", "/"),
+                "kind": f.kind,
+                "severity": f.severity,
+                "file": _to_posix(f.file),
+                "line": f.line,
+                "preview": f.preview,
             }
             for f in findings
         ],
@@ -43,17 +65,17 @@ def secrets_to_dict(findings):
 
 
 def trackedjunk_to_dict(result):
-    d = asdict(result)
-    d["repo_path"] = str(result.repo_path).replace("\\", "/")
-    d["tracked_junk"] = [p.replace("\\", "/") for p in d.get("tracked_junk", [])]
-    return d
+    return {
+        "repo_path": _to_posix(str(result.repo_path)),
+        "tracked_junk": [_to_posix(p) for p in result.tracked_junk],
+    }
 
 def gate_to_dict(payload: dict) -> dict:
     """
     Gate payload is already dict-like but we normalize paths to posix.
     """
     def _posix(s):
-        return (s or "").replace("\\", "/")
+        return _to_posix(s or "")
 
     out = dict(payload)
 
@@ -1,65 +1,24 @@
 from __future__ import annotations
 
+import os
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
 
-from repoclean.rules import get_effective_junk_rules
+from repoclean.path_utils import list_tracked_paths
+from repoclean.rules import get_effective_junk_rules, is_junk_rel_path
 
 
-def _git(repo: Path, args: list[str]) -> subprocess.CompletedProcess:
+def _git(repo: Path, args: list[str], stdin: bytes | None = None) -> subprocess.CompletedProcess:
+    # index updates only (rm --cached / add -u); the tracked listing is
+    # path_utils.list_tracked_paths
     return subprocess.run(
         ["git", "-C", str(repo), *args],
+        input=stdin,
         capture_output=True,
-        text=True,
     )
 
 
-def _get_tracked_paths(repo: Path) -> list[str]:
-    try:
-        p = _git(repo, ["ls-files"])
-    except Exception:
-        return []
-
-    if p.returncode != 0:
-        return []
-
-    out = (p.stdout or "").strip()
-    if not out:
-        return []
-
-    tracked: list[str] = []
-    for line in out.splitlines():
-        rel = line.strip().replace("\\", "/")
-        if not rel:
-            continue
-        if rel.startswith(".git/"):
-            continue
-        tracked.append(rel)
-
-    return tracked
-
-
-def _is_tracked_path_junk(rel_posix: str, *, junk_dirs: set[str], junk_files: set[str], junk_exts: set[str]) -> bool:
-    # rel_posix example: "repoclean/__pycache__/abc.pyc"
-    name = rel_posix.split("/")[-1]
-
-    if name in junk_files:
-        return True
-
-    suffix = Path(name).suffix.lower()
-    if suffix and suffix in junk_exts:
-        return True
-
-    # junk dirs anywhere in path
-    parts = rel_posix.split("/")
-    for part in parts[:-1]:
-        if part in junk_dirs:
-            return True
-
-    return False
-
-
 @dataclass
 class TrackedJunkResult:
     repo_path: Path
@@ -72,7 +31,7 @@ def get_tracked_junk(repo_path: str = ".", config=None) -> TrackedJunkResult:
     repo = Path(repo_path).resolve()
     rules = get_effective_junk_rules(config)
 
-    tracked = _get_tracked_paths(repo)
+    tracked = list_tracked_paths(repo)
     bad: list[str] = []
 
     for rel in tracked:
@@ -85,7 +44,9 @@ def get_tracked_junk(repo_path: str = ".", config=None) -> TrackedJunkResult:
         ):
             continue
 
-        if _is_tracked_path_junk(
+        # same classifier as the scan: no split()/Path() per path, junk dirs
+        # matched by one compiled alternation
+        if is_junk_rel_path(
             rel,
             junk_dirs=rules.dirs,
             junk_files=rules.files,
@@ -93,6 +54,7 @@ def get_tracked_junk(repo_path: str = ".", config=None) -> TrackedJunkResult:
         ):
             bad.append(rel)
 
+    # set(): ls-files lists unmerged paths once per conflict stage
     bad = sorted(set(bad))
 
     return TrackedJunkResult(
@@ -108,15 +70,40 @@ def remove_tracked_paths(repo: Path, rel_paths: list[str]) -> tuple[int, list[st
     """
     repo = Path(repo).resolve()
 
-    removed: list[str] = []
+    cleaned: list[str] = []
+    seen: set[str] = set()
     for rel in rel_paths:
         rel = (rel or "").strip().replace("\\", "/")
-        if not rel:
-            continue
+        if rel and rel not in seen:
+            seen.add(rel)
+            cleaned.append(rel)
 
-        p = _git(repo, ["rm", "--cached", "--quiet", "--", rel])
-        if p.returncode == 0:
-            removed.append(rel)
+    if not cleaned:
+        return 0, []
+
+    # one spawn for all paths, fed on stdin: no argv length limit to hit
+    # (Windows caps a command line at 32767 chars)
+    try:
+        p = _git(
+            repo,
+            ["rm", "--cached", "--quiet", "--pathspec-from-file=-", "--pathspec-file-nul"],
+            stdin=b"\0".join(os.fsencode(rel) for rel in cleaned),
+        )
+        ok = p.returncode == 0
+    except OSError:
+        ok = False
+
+    removed: list[str] = []
+    if ok:
+        removed = cleaned
+    else:
+        # git rm is all-or-nothing (one bad path fails the whole call), and
+        # git < 2.26 has no --pathspec-from-file: go path by path to remove
+        # what can be removed
+        for rel in cleaned:
+            p = _git(repo, ["rm", "--cached", "--quiet", "--", rel])
+            if p.returncode == 0:
+                removed.append(rel)
 
     # stage index updates (so commit reflects removal)
     if removed:
@@ -0,0 +1,33 @@
+import itertools
+from pathlib import Path
+
+import pytest
+
+from repoclean.path_utils import should_ignore, should_ignore_file, suffix_lower
+
+
+RULE_SETS = [
+    {"ignore_dirs": [], "ignore_files": [".env"], "ignore_extensions": []},
+    {"ignore_dirs": [".cache"], "ignore_files": [], "ignore_extensions": []},
+    {"ignore_dirs": ["docs/", "./build"], "ignore_files": ["README.md"], "ignore_extensions": ["log", ".TMP"]},
+    {"ignore_dirs": ["a/b"], "ignore_files": ["env", " id_rsa "], "ignore_extensions": [".env"]},
+]
+
+NAMES = [".env", ".cache", "env", "README.md", "x.log", "y.tmp", "id_rsa", "a.env", "b"]
+DIRS = ["", ".cache/", "docs/", "build/", "a/", "a/b/", "a/.c/", ".github/"]
+
+
+def test_should_ignore_file_agrees_with_should_ignore():
+    for rules, prefix, name in itertools.product(RULE_SETS, DIRS, NAMES):
+        # should_ignore_file() only sees files whose parent dirs weren't pruned
+        parents = prefix.rstrip("/").split("/") if prefix else []
+        if any(should_ignore("/".join(parents[: i + 1]), **rules) for i in range(len(parents))):
+            continue
+
+        rel = prefix + name
+        assert should_ignore_file(rel, **rules) == should_ignore(rel, **rules), (rules, rel)
+
+
+@pytest.mark.parametrize("name", [".env", ".env.local", "a.PYC", "archive.tar.gz", "Makefile", "a..b"])
+def test_suffix_lower_matches_pathlib(name):
+    assert suffix_lower(name) == Path(name).suffix.lower()
@@ -0,0 +1,18 @@
+from repoclean.scanner import scan_repo
+
+
+def test_files_inside_junk_dirs_are_still_checked(tmp_path):
+    build = tmp_path / "build"
+    build.mkdir()
+    (build / "id_rsa").write_text("key\n", encoding="utf-8")
+    with open(build / "big.bin", "wb") as f:
+        f.truncate(2 * 1024 * 1024)
+    (build / "debug.log").write_text("x\n", encoding="utf-8")
+
+    res = scan_repo(str(tmp_path), max_file_mb=1)
+
+    assert res.junk_dirs == ["build"]
+    # the junk dir is reported as a whole, not file by file
+    assert res.junk_files == []
+    assert res.sensitive_files == ["build/id_rsa"]
+    assert res.large_files == [("build/big.bin", 2 * 1024 * 1024)]
@@ -0,0 +1,49 @@
+import subprocess
+
+from repoclean import tracked_junk
+from repoclean.tracked_junk import remove_tracked_paths
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True).stdout
+
+
+def _repo_with_logs(tmp_path, n):
+    _git(tmp_path, "init", "-q")
+    deep = tmp_path / "node_modules" / ("very-long-package-name-" * 3) / "lib"
+    deep.mkdir(parents=True)
+    rels = []
+    for i in range(n):
+        (deep / f"debug-{i}.log").write_text("x\n", encoding="utf-8")
+        rels.append(f"{deep.relative_to(tmp_path).as_posix()}/debug-{i}.log")
+    _git(tmp_path, "add", "-f", ".")
+    return rels
+
+
+def test_remove_tracked_paths_handles_long_path_lists(tmp_path):
+    # ~600 paths of ~100 chars: over the Windows command line limit as argv
+    rels = _repo_with_logs(tmp_path, 600)
+
+    count, removed = remove_tracked_paths(tmp_path, rels)
+
+    assert count == 600 and removed == rels
+    assert _git(tmp_path, "ls-files") == ""
+    assert all((tmp_path / rel).exists() for rel in rels)
+
+
+def test_remove_tracked_paths_falls_back_per_path(tmp_path, monkeypatch):
+    rels = _repo_with_logs(tmp_path, 3)
+    real_git = tracked_junk._git
+
+    def no_stdin_git(repo, args, stdin=None):
+        if stdin is not None:
+            raise OSError("command line too long")
+        return real_git(repo, args)
+
+    monkeypatch.setattr(tracked_junk, "_git", no_stdin_git)
+
+    # an untracked path makes git rm fail as a whole; the others still go
+    count, removed = remove_tracked_paths(tmp_path, rels + ["not/tracked.log"])
+
+    assert count == 3 and removed == rels
+    assert _git(tmp_path, "ls-files") == ""